@@ -0,0 +1,236 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import time
+
+from aiohttp import web
+
+from utils.logger import Logger
+from utils.memory_governor import MemoryGovernor, estimate_footprint
+from utils.scheduler import scheduling_key
+from video_processing.item_renderer import CONFIG_DIR, ItemRenderer
+
+
+class Job:
+    """A render request for a single input item."""
+
+    def __init__(self, job_id, item):
+        self.job_id = job_id
+        self.item = item
+        self.status = "queued"
+        self.progress = 0.0
+        self.memory_bytes = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def update_progress(self, done, total):
+        self.progress = done / total if total else 1.0
+
+    def to_dict(self):
+        return {
+            "id": self.job_id,
+            "name": self.item.get("name"),
+            "priority": self.item.get("priority", 0),
+            "deadline": self.item.get("deadline"),
+            "status": self.status,
+            "progress": self.progress,
+            "memory_bytes": self.memory_bytes,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class RenderDaemon:
+    """
+    Long-running render service.
+
+    Configs, caches and TTS state live in a single ItemRenderer so every
+    job after the first one skips the startup cost paid by main.py.
+    """
+
+    def __init__(self, renderer, logger, governor, workers=1):
+        self.renderer = renderer
+        self.logger = logger
+        self.governor = governor
+        self.workers = workers
+        self.jobs = {}
+        self.queue = asyncio.PriorityQueue()
+        self._job_ids = itertools.count(1)
+        self._worker_tasks = []
+
+    def create_app(self):
+        app = web.Application()
+        app.add_routes(
+            [
+                web.post("/jobs", self.submit_jobs),
+                web.get("/jobs", self.list_jobs),
+                web.get("/jobs/{job_id}", self.get_job),
+                web.get("/jobs/{job_id}/result", self.get_job_result),
+                web.get("/status", self.get_status),
+            ]
+        )
+        app.on_startup.append(self._start_workers)
+        app.on_cleanup.append(self._stop_workers)
+        return app
+
+    def submit(self, item):
+        """Validate an item and queue it by priority, deadline and predicted cost."""
+        self.renderer.validate_item(item)
+        job_number = next(self._job_ids)
+        key = scheduling_key(item, self.renderer.formats, job_number)
+        job = Job(str(job_number), item)
+        self.jobs[job.job_id] = job
+        self.queue.put_nowait((key, job))
+        return job
+
+    async def submit_jobs(self, request):
+        """Accept a single item or a list of items using the input file schema."""
+        try:
+            payload = await request.json()
+        except json.JSONDecodeError:
+            raise web.HTTPBadRequest(text="Request body is not valid JSON.")
+
+        items = payload if isinstance(payload, list) else [payload]
+        try:
+            for item in items:
+                self.renderer.validate_item(item)
+                scheduling_key(item, self.renderer.formats, 0)
+        except ValueError as e:
+            raise web.HTTPBadRequest(text=str(e))
+
+        jobs = [self.submit(item) for item in items]
+        return web.json_response([job.to_dict() for job in jobs], status=202)
+
+    async def list_jobs(self, request):
+        return web.json_response([job.to_dict() for job in self.jobs.values()])
+
+    async def get_job(self, request):
+        return web.json_response(self._get_job(request).to_dict())
+
+    async def get_job_result(self, request):
+        job = self._get_job(request)
+        if job.status in ("queued", "running"):
+            raise web.HTTPConflict(text=f"Job {job.job_id} is still {job.status}.")
+        return web.json_response(
+            {
+                "id": job.job_id,
+                "status": job.status,
+                "result": job.result,
+                "error": job.error,
+            }
+        )
+
+    async def get_status(self, request):
+        return web.json_response(
+            {"queued_jobs": self.queue.qsize(), "memory": self.governor.usage()}
+        )
+
+    def _get_job(self, request):
+        job = self.jobs.get(request.match_info["job_id"])
+        if not job:
+            raise web.HTTPNotFound(text="Job not found.")
+        return job
+
+    async def _start_workers(self, app):
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+
+    async def _stop_workers(self, app):
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        await self.renderer.close()
+
+    async def _worker(self):
+        while True:
+            _, job = await self.queue.get()
+            try:
+                video_format = self.renderer.get_format(job.item["name"])
+                job.memory_bytes = estimate_footprint(
+                    job.item,
+                    video_format,
+                    mixes_music=self.renderer.music_bed is not None,
+                )
+                async with self.governor.reserve(job.job_id, job.memory_bytes):
+                    await self._run(job)
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)
+                self.logger.log_error(f"Job {job.job_id} failed: {e}")
+            finally:
+                job.finished_at = time.time()
+                self.queue.task_done()
+
+    async def _run(self, job):
+        job.status = "running"
+        job.started_at = time.time()
+        job.result = await self.renderer.render_item(
+            job.item, progress_callback=job.update_progress
+        )
+        errors = []
+        for language_code, result in job.result.items():
+            if result["status"] != "done":
+                self.logger.log_error(
+                    f"Job {job.job_id} ({job.item['name']}) in {language_code}: {result['message']}"
+                )
+            if result["status"] == "error":
+                errors.append(f"{language_code}: {result['message']}")
+
+        # Warnings still export the audio; errors leave a language without it
+        if not errors:
+            job.status = "done"
+        elif len(errors) == len(job.result):
+            job.status = "failed"
+        else:
+            job.status = "partial"
+        job.error = "\n".join(errors) if errors else None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Keep the render pipeline warm and accept jobs over a local HTTP API."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--socket", help="Listen on this Unix socket instead of host/port"
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--memory-budget-mb",
+        type=int,
+        help="Memory budget for jobs in flight (default: memory.budget_mb in the config)",
+    )
+    parser.add_argument("--output-dir", default=".")
+    parser.add_argument("--config", default=os.path.join(CONFIG_DIR, "config.json"))
+    parser.add_argument(
+        "--format-config", default=os.path.join(CONFIG_DIR, "video_format.json")
+    )
+    args = parser.parse_args()
+
+    os.makedirs("logs", exist_ok=True)
+    logger = Logger("logs")
+
+    renderer = ItemRenderer(args.output_dir, args.config, args.format_config)
+    budget_mb = args.memory_budget_mb or renderer.config.get("memory", {}).get(
+        "budget_mb", 2048
+    )
+    governor = MemoryGovernor(budget_mb * 1024 * 1024, cache_bytes=renderer.cache_bytes)
+    daemon = RenderDaemon(renderer, logger, governor, workers=args.workers)
+
+    if args.socket:
+        web.run_app(daemon.create_app(), path=args.socket)
+    else:
+        web.run_app(daemon.create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,41 @@ import json
 import os
 import sys
 
-from Exceptions import DurationExceededError
-from Logger import Logger
-from Quiz import Quiz
-from WYR import WYR
+from utils.logger import Logger
+from utils.scheduler import schedule_items
+from video_processing.item_renderer import ItemRenderer
+
+
+async def process_items(renderer, items, logger):
+    """Render every item in one event loop so TTS connections stay warm."""
+    try:
+        for data in items:
+            try:
+                renderer.validate_item(data)
+            except ValueError as e:
+                print(e)
+                logger.log_error(str(e))
+                continue
+
+            name = data["name"]
+            try:
+                results = await renderer.render_item(data)
+            except Exception as e:
+                logger.log_error(f"Error processing {name}: {e}")
+                continue
+
+            for language_code, result in results.items():
+                language = renderer.get_language_name(language_code)
+                if result["status"] == "warning":
+                    logger.log_error(
+                        f"Warning processing {name} in {language}: {result['message']}"
+                    )
+                elif result["status"] == "error":
+                    logger.log_error(
+                        f"Error processing {name} in {language}: {result['message']}"
+                    )
+    finally:
+        await renderer.close()
 
 
 def main():
@@ -21,13 +52,6 @@ def main():
 
     # Create directories
     os.makedirs("logs", exist_ok=True)
-    os.makedirs("quiz", exist_ok=True)
-    os.makedirs(os.path.join("quiz", "all_quizzes"), exist_ok=True)
-    os.makedirs("wyr", exist_ok=True)
-    os.makedirs(os.path.join("wyr", "all_wyr"), exist_ok=True)
-
-    all_quizzes_dir = os.path.join("quiz", "all_quizzes")
-    all_wyr_dir = os.path.join("wyr", "all_wyr")
 
     logger = Logger("logs")
 
@@ -44,99 +68,15 @@ def main():
         logger.log_error(f"Input file '{input_file_path}' is not a valid JSON file.")
         sys.exit(1)
 
-    # Process JSON file data
-    for data in input_file:
-        name = data.get("name")
-        content = data.get("content")
-
-        if not name or not content:
-            print(f"Invalid quiz data: {data}")
-            logger.log_error(f"Invalid quiz data: {data}")
-            continue
+    # Configs are parsed once; each item is planned once and only the
+    # speech of each language is rendered separately
+    renderer = ItemRenderer()
 
-        if "quiz" in name:
+    # Run items by priority and deadline, shortest predicted job first
+    input_file = schedule_items(input_file, renderer.formats, logger)
 
-            lines_en = content.get("en", [])
-            lines_pt = content.get("pt", [])
-
-            quiz_dir = os.path.join("quiz", name)
-            os.makedirs(quiz_dir, exist_ok=True)
-
-            quiz = Quiz()
-
-            # English Quiz
-            try:
-                asyncio.run(
-                    quiz.process_quiz(name, lines_en, "en", quiz_dir, [all_quizzes_dir])
-                )
-            except DurationExceededError as e:
-                logger.log_error(f"Warning processing {name} in English: {e}")
-            except ValueError as e:
-                logger.log_error(f"Error processing {name} in English: {e}")
-
-            # Portuguese Quiz
-            try:
-                asyncio.run(
-                    quiz.process_quiz(name, lines_pt, "pt", quiz_dir, [all_quizzes_dir])
-                )
-            except DurationExceededError as e:
-                logger.log_error(f"Warning processing {name} in Portuguese: {e}")
-            except ValueError as e:
-                logger.log_error(f"Error processing {name} in Portuguese: {e}")
-
-        elif "wyr" in name:
-
-            lines_en = content.get("en", [])
-            lines_pt = content.get("pt", [])
-
-            # Ensure there is an even number of lines for both languages
-            if len(lines_en) % 2 != 0 or len(lines_pt) % 2 != 0:
-                logger.log_error(
-                    f"Odd number of lines in WYR data for {name}. Lines should be even."
-                )
-                continue
-
-            # Concatenate lines
-            concatenated_lines_en = [
-                f"{lines_en[i]}, or {lines_en[i+1]}" for i in range(0, len(lines_en), 2)
-            ]
-            concatenated_lines_pt = [
-                f"{lines_pt[i]}, ou {lines_pt[i+1]}" for i in range(0, len(lines_pt), 2)
-            ]
-
-            wyr_dir = os.path.join("wyr", name)
-            os.makedirs(wyr_dir, exist_ok=True)
-
-            wyr = WYR()
-
-            # English Quiz
-            try:
-                asyncio.run(
-                    wyr.process_wyr(
-                        name, concatenated_lines_en, "en", wyr_dir, [all_wyr_dir]
-                    )
-                )
-            except DurationExceededError as e:
-                logger.log_error(f"Warning processing {name} in English: {e}")
-            except Exception as e:
-                logger.log_error(f"Error processing {name} in English: {e}")
-
-            # Portuguese Quiz
-            try:
-                asyncio.run(
-                    wyr.process_wyr(
-                        name, concatenated_lines_pt, "pt", wyr_dir, [all_wyr_dir]
-                    )
-                )
-            except DurationExceededError as e:
-                logger.log_error(f"Warning processing {name} in Portuguese: {e}")
-            except Exception as e:
-                logger.log_error(f"Error processing {name} in Portuguese: {e}")
-
-        else:
-            print(f"Unexpected quiz name format: {name}")
-            logger.log_error(f"Unexpected quiz name format: {name}")
-            continue
+    # Process JSON file data
+    asyncio.run(process_items(renderer, input_file, logger))
 
 
 if __name__ == "__main__":
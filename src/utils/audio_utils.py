@@ -1,10 +1,18 @@
 import os
+from functools import lru_cache
 
 from pydub import AudioSegment
+from utils.codec import export_mp3
+
+
+@lru_cache(maxsize=64)
+def silence(duration, frame_rate=11025):
+    """Return a cached silent segment; AudioSegments are immutable."""
+    return AudioSegment.silent(duration=duration, frame_rate=frame_rate)
 
 
 def add_initial_silence(audio, silence_duration):
-    silence_segment = AudioSegment.silent(duration=silence_duration)
+    silence_segment = silence(silence_duration, audio.frame_rate)
     return silence_segment + audio
 
 
@@ -12,12 +20,13 @@ def ensure_required_duration(audio, required_duration, exceeds_duration=0):
     total_duration = len(audio)
     if total_duration < required_duration:
         if not exceeds_duration:
-            remaining_silence = AudioSegment.silent(
-                duration=required_duration - total_duration
+            remaining_silence = silence(
+                required_duration - total_duration, audio.frame_rate
             )
         else:
-            remaining_silence = AudioSegment.silent(
-                duration=required_duration - (total_duration + exceeds_duration)
+            remaining_silence = silence(
+                required_duration - (total_duration + exceeds_duration),
+                audio.frame_rate,
             )
         audio += remaining_silence
         exceeds_duration = 0
@@ -34,6 +43,8 @@ def concatenate_audio(audio_segments):
 
 
 def export_audio(audio, audio_name, export_dirs, language_code):
-    for dir_path in export_dirs:
-        output_path = os.path.join(dir_path, f"{audio_name}_final_{language_code}.mp3")
-        audio.export(output_path, format="mp3")
+    output_paths = [
+        os.path.join(dir_path, f"{audio_name}_final_{language_code}.mp3")
+        for dir_path in export_dirs
+    ]
+    export_mp3(audio, output_paths)
@@ -0,0 +1,96 @@
+import io
+
+import numpy as np
+from pydub import AudioSegment
+
+try:
+    import av
+except ImportError:  # Fall back to pydub, which spawns one ffmpeg per call
+    av = None
+
+MP3_BITRATE = 128_000
+
+
+def _layout(channels):
+    return "mono" if channels == 1 else "stereo"
+
+
+def _decode_with_av(source, format):
+    with av.open(source, format=format) as container:
+        resampler = None
+        pcm = bytearray()
+        for frame in container.decode(audio=0):
+            if resampler is None:
+                channels = min(len(frame.layout.channels), 2)
+                frame_rate = frame.sample_rate
+                resampler = av.AudioResampler(
+                    format="s16", layout=_layout(channels), rate=frame_rate
+                )
+            for resampled in resampler.resample(frame):
+                pcm += resampled.to_ndarray().tobytes()
+
+        if resampler is None:
+            return AudioSegment.empty()
+        for resampled in resampler.resample(None):
+            pcm += resampled.to_ndarray().tobytes()
+
+    return AudioSegment(
+        data=bytes(pcm), sample_width=2, frame_rate=frame_rate, channels=channels
+    )
+
+
+def _encode_with_av(audio):
+    audio = audio.set_sample_width(2)
+    if audio.channels > 2:
+        audio = audio.set_channels(2)
+    layout = _layout(audio.channels)
+
+    output = io.BytesIO()
+    with av.open(output, mode="w", format="mp3") as container:
+        stream = container.add_stream("mp3", rate=audio.frame_rate)
+        stream.layout = layout
+        stream.bit_rate = MP3_BITRATE
+
+        samples = np.frombuffer(audio.raw_data, dtype=np.int16).reshape(1, -1)
+        frame = av.AudioFrame.from_ndarray(samples, format="s16", layout=layout)
+        frame.sample_rate = audio.frame_rate
+
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+    return output.getvalue()
+
+
+def decode(source, format=None):
+    """
+    Decode an audio file path or stream into an AudioSegment.
+
+    Uses the in-process PyAV binding when it is installed, so decoding a
+    segment does not start an ffmpeg process.
+    """
+    if av is None:
+        return AudioSegment.from_file(source, format=format)
+    try:
+        return _decode_with_av(source, format)
+    except av.error.FFmpegError as e:
+        raise ValueError(f"Could not decode audio: {e}")
+
+
+def encode_mp3(audio):
+    """Encode an AudioSegment to MP3 bytes."""
+    if av is None:
+        output = io.BytesIO()
+        audio.export(output, format="mp3", bitrate=f"{MP3_BITRATE // 1000}k")
+        return output.getvalue()
+    return _encode_with_av(audio)
+
+
+def export_mp3(audio, output_paths):
+    """Encode an AudioSegment once and write it to every output path."""
+    data = encode_mp3(audio)
+    for output_path in output_paths:
+        with open(output_path, "wb") as file:
+            file.write(data)
+    return data
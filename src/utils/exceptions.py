@@ -6,3 +6,8 @@ class DurationExceededError(Exception):
 class AudioProcessingError(Exception):
     def __init__(self, message):
         super().__init__(message)
+
+
+class TTSConnectionError(Exception):
+    def __init__(self, message):
+        super().__init__(message)
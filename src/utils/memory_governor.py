@@ -0,0 +1,107 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+
+# edge-tts returns 24 kHz mono MP3 at 48 kbit/s, decoded to 16-bit PCM
+MP3_BYTES_PER_MS = 48_000 / 8 / 1000
+PCM_BYTES_PER_MS = 24_000 * 2 / 1000
+
+# Decoded copies alive at the peak of a render: the processed segments, the
+# concatenated track and the copy made by the last concatenation
+PEAK_PCM_COPIES = 3
+
+# Copies alive while a music bed is mixed in: the processed segments, the
+# concatenated track, the mixed track and its bytes. The float math of the
+# mix works on small blocks and is not counted.
+MIXING_PCM_COPIES = 4
+
+
+def estimate_footprint(item, video_format, mixes_music=False):
+    """
+    Estimate the peak memory in bytes used to render an item.
+
+    Languages are rendered one after the other, so the peak is the one of
+    the longest language.
+    """
+    pcm_copies = PEAK_PCM_COPIES
+    if mixes_music:
+        pcm_copies = max(PEAK_PCM_COPIES, MIXING_PCM_COPIES)
+
+    footprint = 0
+    for lines in item.get("content", {}).values():
+        num_segments = video_format.count_segments(len(lines))
+        duration = video_format.get_total_duration(num_segments)
+        footprint = max(
+            footprint,
+            duration * (MP3_BYTES_PER_MS + PCM_BYTES_PER_MS * pcm_copies),
+        )
+    return int(footprint)
+
+
+class MemoryGovernor:
+    """
+    Admit jobs only while their estimated footprints fit in a memory budget.
+
+    Jobs are admitted in arrival order, so a large job is never starved by
+    a stream of small ones. A job larger than the whole budget is admitted
+    once nothing else is running. cache_bytes, if given, returns the bytes
+    held by caches that outlive jobs, which are counted as used.
+    """
+
+    def __init__(self, budget_bytes, cache_bytes=None):
+        self.budget_bytes = budget_bytes
+        self.cache_bytes = cache_bytes
+        self.reserved = {}  # job id -> reserved bytes
+        self.peak_bytes = 0
+        self._waiters = deque()
+        self._condition = None
+
+    @property
+    def used_bytes(self):
+        return sum(self.reserved.values()) + self._get_cache_bytes()
+
+    def _get_cache_bytes(self):
+        return self.cache_bytes() if self.cache_bytes else 0
+
+    def _can_admit(self, ticket, num_bytes):
+        if self._waiters[0] is not ticket:
+            return False
+        return not self.reserved or self.used_bytes + num_bytes <= self.budget_bytes
+
+    @asynccontextmanager
+    async def reserve(self, job_id, num_bytes):
+        """Wait until num_bytes fit in the budget and hold them for the block."""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+
+        ticket = object()
+        async with self._condition:
+            self._waiters.append(ticket)
+            try:
+                await self._condition.wait_for(
+                    lambda: self._can_admit(ticket, num_bytes)
+                )
+            finally:
+                self._waiters.remove(ticket)
+                self._condition.notify_all()
+
+            self.reserved[job_id] = num_bytes
+            self.peak_bytes = max(self.peak_bytes, self.used_bytes)
+
+        try:
+            yield
+        finally:
+            async with self._condition:
+                del self.reserved[job_id]
+                self._condition.notify_all()
+
+    def usage(self):
+        return {
+            "budget_bytes": self.budget_bytes,
+            "used_bytes": self.used_bytes,
+            "available_bytes": max(self.budget_bytes - self.used_bytes, 0),
+            "peak_bytes": self.peak_bytes,
+            "cache_bytes": self._get_cache_bytes(),
+            "running_jobs": len(self.reserved),
+            "waiting_jobs": len(self._waiters),
+        }
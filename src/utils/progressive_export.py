@@ -0,0 +1,158 @@
+import json
+import os
+import re
+import sys
+import time
+
+from utils.audio_utils import concatenate_audio
+from utils.codec import decode, encode_mp3, export_mp3
+
+MANIFEST_NAME = "manifest.json"
+CHUNK_PATTERN = re.compile(r"chunk_\d{5}\.mp3")
+
+
+def get_progressive_dir(dir_path, audio_name, language_code):
+    return os.path.join(dir_path, f"{audio_name}_final_{language_code}")
+
+
+def _write_atomically(path, data):
+    """Write data so readers only ever see the complete file."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(data)
+    os.replace(temp_path, path)
+
+
+def _remove_chunks(output_dir):
+    """Remove the chunks of a previous export, which the new manifest does not list."""
+    for file_name in os.listdir(output_dir):
+        if CHUNK_PATTERN.fullmatch(file_name):
+            os.remove(os.path.join(output_dir, file_name))
+
+
+def _write_manifest(output_dirs, manifest):
+    data = json.dumps(manifest, indent=4).encode("utf-8")
+    for output_dir in output_dirs:
+        _write_atomically(os.path.join(output_dir, MANIFEST_NAME), data)
+
+
+def export_audio_progressive(
+    audio, audio_name, export_dirs, language_code, chunk_duration=5000
+):
+    """
+    Export audio as a directory of MP3 chunks plus a manifest.
+
+    The manifest is rewritten after every chunk, so consumers can start on
+    the first chunks while the rest is still being encoded. Each chunk is
+    encoded once and copied to every export directory. Chunks are standalone
+    MP3 files with their own headers and padding: join them with
+    join_progressive_export, not by appending their bytes.
+    """
+    output_dirs = [
+        get_progressive_dir(dir_path, audio_name, language_code)
+        for dir_path in export_dirs
+    ]
+    for output_dir in output_dirs:
+        os.makedirs(output_dir, exist_ok=True)
+
+    manifest = {
+        "name": audio_name,
+        "language": language_code,
+        "format": "mp3",
+        "duration": len(audio),
+        "chunk_duration": chunk_duration,
+        "complete": False,
+        "chunks": [],
+    }
+    _write_manifest(output_dirs, manifest)
+
+    # Only once the new manifest no longer lists them
+    for output_dir in output_dirs:
+        _remove_chunks(output_dir)
+
+    for index, start in enumerate(range(0, len(audio), chunk_duration)):
+        chunk = audio[start : start + chunk_duration]
+        chunk_data = encode_mp3(chunk)
+
+        file_name = f"chunk_{index:05d}.mp3"
+        for output_dir in output_dirs:
+            _write_atomically(os.path.join(output_dir, file_name), chunk_data)
+
+        manifest["chunks"].append(
+            {
+                "file": file_name,
+                "start": start,
+                "duration": len(chunk),
+                "bytes": len(chunk_data),
+            }
+        )
+        _write_manifest(output_dirs, manifest)
+
+    manifest["complete"] = True
+    _write_manifest(output_dirs, manifest)
+
+    return [os.path.join(output_dir, MANIFEST_NAME) for output_dir in output_dirs]
+
+
+def follow_manifest(manifest_path, poll_interval=0.5, timeout=None):
+    """
+    Yield the path of every chunk of a progressive export as soon as it is
+    listed in the manifest, until the export is complete.
+    """
+    output_dir = os.path.dirname(manifest_path)
+    deadline = time.monotonic() + timeout if timeout else None
+    next_chunk = 0
+
+    while True:
+        manifest = None
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+
+            for chunk in manifest["chunks"][next_chunk:]:
+                yield os.path.join(output_dir, chunk["file"])
+            next_chunk = len(manifest["chunks"])
+
+            if manifest["complete"]:
+                return
+
+        if deadline and time.monotonic() > deadline:
+            raise TimeoutError(f"Progressive export {manifest_path} did not complete.")
+        time.sleep(poll_interval)
+
+
+def join_progressive_export(
+    manifest_path, poll_interval=0.5, timeout=None, chunk_callback=None
+):
+    """
+    Decode the chunks of a progressive export as they are written and join
+    them. chunk_callback, if given, is called with the path of each decoded
+    chunk.
+    """
+    chunks = []
+    for chunk_path in follow_manifest(manifest_path, poll_interval, timeout):
+        chunks.append(decode(chunk_path, format="mp3"))
+        if chunk_callback:
+            chunk_callback(chunk_path)
+    return concatenate_audio(chunks)
+
+
+def main():
+    """Local sink: join the chunks of a progressive export into one MP3 file."""
+    if len(sys.argv) != 3:
+        print(
+            f"Number of arguments incorrect!\nUsage example: python {sys.argv[0]} <manifest_path> <output_file_path>"
+        )
+        sys.exit(1)
+
+    manifest_path, output_file_path = sys.argv[1], sys.argv[2]
+    audio = join_progressive_export(
+        manifest_path,
+        chunk_callback=lambda chunk_path: print(f"Decoded {chunk_path}"),
+    )
+    export_mp3(audio, [output_file_path])
+    print(f"Exported {len(audio)} ms to {output_file_path}")
+
+
+if __name__ == "__main__":
+    main()
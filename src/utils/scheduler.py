@@ -0,0 +1,94 @@
+import math
+from datetime import datetime
+
+
+def find_format(name, formats):
+    """Return the video format whose name appears in the item name, or None."""
+    for format_name, video_format in formats.items():
+        if format_name in name:
+            return video_format
+    return None
+
+
+def predicted_cost(item, video_format):
+    """
+    Predict the work needed for an item as the total audio duration in ms
+    rendered across all of its languages.
+    """
+    content = item.get("content")
+    if not isinstance(content, dict):
+        return 0
+
+    cost = 0
+    for lines in content.values():
+        if not isinstance(lines, list):
+            continue
+        num_segments = video_format.count_segments(len(lines))
+        cost += video_format.get_total_duration(num_segments)
+    return cost
+
+
+def parse_priority(value):
+    """Return the item priority. Higher priorities run first, the default is 0."""
+    if value is None:
+        return 0
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"Invalid priority {value!r}: expected an integer")
+    return value
+
+
+def parse_deadline(value):
+    """Return the item deadline as a POSIX timestamp, or math.inf if it has none."""
+    if value is None:
+        return math.inf
+    try:
+        deadline = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid deadline {value!r}: expected an ISO 8601 date")
+    return deadline.timestamp()  # Naive deadlines are read as local time
+
+
+def scheduling_key(item, formats, index):
+    """
+    Sort key of an item: priority class first, then earliest deadline, then
+    shortest predicted cost. index keeps the input order for ties.
+    """
+    video_format = find_format(item.get("name") or "", formats)
+    cost = predicted_cost(item, video_format) if video_format else 0
+    return (
+        -parse_priority(item.get("priority")),
+        parse_deadline(item.get("deadline")),
+        cost,
+        index,
+    )
+
+
+def schedule_items(items, formats, logger=None):
+    """
+    Order input items so urgent videos finish first.
+
+    Items with invalid scheduling fields keep the default priority and no
+    deadline; the problem is reported through logger if one is given.
+    """
+    keyed_items = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            keyed_items.append(((0, math.inf, 0, index), item))
+            continue
+
+        try:
+            key = scheduling_key(item, formats, index)
+        except ValueError as e:
+            if logger:
+                logger.log_error(
+                    f"Ignoring scheduling fields of {item.get('name')}: {e}"
+                )
+            key = scheduling_key(
+                {"name": item.get("name"), "content": item.get("content")},
+                formats,
+                index,
+            )
+        keyed_items.append((key, item))
+
+    keyed_items.sort(key=lambda keyed_item: keyed_item[0])
+    return [item for _, item in keyed_items]
@@ -1,10 +1,13 @@
 import json
 import os
 
-from ..utils.json_exceptions import JSONConfigurationError, JSONWarning
+from utils.json_exceptions import JSONConfigurationError, JSONWarning
 
 
 class VideoFormat:
+    # Number of input lines read in a single video segment
+    lines_per_segment = 1
+
     def __init__(self, config_path="../../config/video_format.json"):
         self.config_path = config_path
         self.load_config()
@@ -71,8 +74,9 @@ class VideoFormat:
                 )
 
         if errors:
+            error_list = "\n".join(errors)
             raise JSONConfigurationError(
-                f"Configuration validation failed with the following errors: {'\n'.join(errors)}"
+                f"Configuration validation failed with the following errors: {error_list}"
             )
 
     def get_config(self):
@@ -84,3 +88,18 @@ class VideoFormat:
             "outro_initial_silence": self.outro_initial_silence,
             "video_segment_initial_silence": self.video_segment_initial_silence,
         }
+
+    def count_segments(self, num_lines):
+        """Return the number of content segments built from num_lines input lines."""
+        num_segments = num_lines // self.lines_per_segment
+        if self.intro_duration > 0 and num_segments:
+            num_segments -= 1  # The first line is read in the intro
+        return num_segments
+
+    def get_total_duration(self, num_segments):
+        """Return the duration in ms of a video with num_segments content segments."""
+        return (
+            self.intro_duration
+            + self.video_segment_duration * num_segments
+            + self.outro_duration
+        )
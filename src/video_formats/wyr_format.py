@@ -3,6 +3,7 @@ from video_formats.video_format import VideoFormat
 
 class WYRFormat(VideoFormat):
     format_name = "wyr"
+    lines_per_segment = 2
 
     def __init__(self, config_path="../../config/video_format.json"):
         super().__init__(config_path)
@@ -2,6 +2,7 @@ import asyncio
 import os
 
 from pydub import AudioSegment
+from utils.codec import decode, export_mp3
 from utils.exceptions import DurationExceededError
 from utils.json_exceptions import JSONConfigurationError
 from video_processing.text_to_speech import TextToSpeech
@@ -81,7 +82,7 @@ class Audio:
         exceeds_delay = 0
         temp_files_exceed_duration = False
         for index, output_file in audio_segments:
-            audio = AudioSegment.from_file(output_file, format="mp3")
+            audio = decode(output_file, format="mp3")
 
             # Determine if the current segment is intro/outro or a question
             if self.include_intro_outro and (
@@ -137,11 +138,12 @@ class Audio:
         return combined
 
     def _export_final_audio(self, final_audio, video_name, language, export_dirs):
-        for dir_path in export_dirs:
-            final_output_file = os.path.join(
-                dir_path, f"{video_name}_final_{language}.mp3"
-            )
-            final_audio.export(final_output_file, format="mp3")
+        final_output_files = [
+            os.path.join(dir_path, f"{video_name}_final_{language}.mp3")
+            for dir_path in export_dirs
+        ]
+        export_mp3(final_audio, final_output_files)
+        for final_output_file in final_output_files:
             print(f"Final audio file {final_output_file} created.")
 
     def _validate_and_cleanup(
@@ -3,17 +3,37 @@ from collections.abc import Iterable
 
 from pydub import AudioSegment
 from utils.audio_utils import *
+from utils.codec import decode
 from utils.exceptions import AudioProcessingError, DurationExceededError
 from utils.json_exceptions import JSONConfigurationError
+from utils.progressive_export import export_audio_progressive
 from utils.utils import cleanup_memory_files
 from video_processing.text_to_speech import TextToSpeech
 
 
 class Audio:
-    def __init__(self, name, data, config, export_dirs):
+    def __init__(
+        self,
+        name,
+        data,
+        config,
+        export_dirs,
+        text_to_speech=None,
+        music_bed=None,
+        chunk_duration=None,
+        shared_segments=None,
+        expected_duration=None,
+    ):
         self.name = name
-        self.text_to_speech = TextToSpeech()
+        self.text_to_speech = text_to_speech if text_to_speech else TextToSpeech()
         self.data = data
+        self.music_bed = music_bed
+        self.chunk_duration = chunk_duration
+        # Decoded segments reused as is, e.g. an outro shared by every language
+        self.shared_segments = shared_segments if shared_segments else {}
+        self.expected_duration = expected_duration
+        self.slot_durations = []  # Required duration of each processed segment
+        self.speech_spans = []  # (initial silence, speech duration) of each segment
         self._get_config(config)
 
     def _get_config(self, config):
@@ -32,14 +52,37 @@ class Audio:
         # Step 1: Generate temporary audio files from text data
         audio_segments_map = await self._generate_audio_segments(language_code)
 
+        # Steps 2-5 are CPU bound, run them off the event loop so other videos
+        # (and a daemon's API) keep being served meanwhile
+        await asyncio.to_thread(
+            self._assemble_audio, audio_segments_map, language_code, export_dirs
+        )
+
+    def _assemble_audio(self, audio_segments_map, language_code, export_dirs):
+
         # Step 2: Process each audio segment (add silences, ensure duration)
         processed_segments = self._process_audio_segments(audio_segments_map)
 
         # Step 3: Concatenate all segments into one final audio
         final_audio = concatenate_audio(processed_segments)
 
-        # Step 4: Export the final audio file
-        export_audio(final_audio, self.name, export_dirs, language_code)
+        # Step 4: Mix the ducked music bed under the speech
+        if self.music_bed:
+            final_audio = self.music_bed.mix(
+                final_audio, self._get_speech_timeline(processed_segments)
+            )
+
+        # Step 5: Export the final audio file, in chunks if progressive
+        if self.chunk_duration:
+            export_audio_progressive(
+                final_audio,
+                self.name,
+                export_dirs,
+                language_code,
+                self.chunk_duration,
+            )
+        else:
+            export_audio(final_audio, self.name, export_dirs, language_code)
 
         # Validation
         self._validate_audio(final_audio, processed_segments)
@@ -48,7 +91,8 @@ class Audio:
 
         tasks = [
             asyncio.create_task(self._generate_tts_task(line, language_code))
-            for text in self.data.values()
+            for section, text in self.data.items()
+            if section not in self.shared_segments
             for line in text
         ]
 
@@ -65,26 +109,29 @@ class Audio:
         """Map the audio segments to intro, content, and outro based on config."""
         audio_segments_map = {}
 
+        has_intro = self.intro_duration > 0 and "intro" not in self.shared_segments
+        has_outro = self.outro_duration > 0 and "outro" not in self.shared_segments
+
         # Mapping the segments to appropriate sections
-        if self.intro_duration > 0:
-            audio_segments_map["intro"] = audio_segments[0]
-            content_segments = (
-                audio_segments[1:-1] if self.outro_duration > 0 else audio_segments[1:]
-            )
+        if has_intro:
+            audio_segments_map["intro"] = audio_segments[:1]
+            content_segments = audio_segments[1:-1] if has_outro else audio_segments[1:]
         else:
-            content_segments = (
-                audio_segments[:-1] if self.outro_duration > 0 else audio_segments
-            )
+            content_segments = audio_segments[:-1] if has_outro else audio_segments
 
         audio_segments_map["content"] = content_segments
 
-        if self.outro_duration > 0:
-            audio_segments_map["outro"] = audio_segments[-1]
+        if has_outro:
+            audio_segments_map["outro"] = audio_segments[-1:]
+
+        audio_segments_map.update(self.shared_segments)
 
         return audio_segments_map
 
     def _process_audio_segments(self, audio_segments_map):
         processed_segments = []
+        self.slot_durations = []
+        self.speech_spans = []
 
         exceeds_duration = 0
 
@@ -129,12 +176,18 @@ class Audio:
 
         for audio_stream in audio_segments:
             try:
-                audio = AudioSegment.from_file(audio_stream, format="mp3")
+                if isinstance(audio_stream, AudioSegment):
+                    audio = audio_stream
+                else:
+                    audio = decode(audio_stream, format="mp3")
+                speech_duration = len(audio)
                 audio = add_initial_silence(audio, initial_silence)
                 audio, exceeds_duration = ensure_required_duration(
                     audio, duration, exceeds_duration
                 )
                 processed_segments.append(audio)
+                self.slot_durations.append(duration)
+                self.speech_spans.append((initial_silence, speech_duration))
             except Exception as e:
                 raise AudioProcessingError(
                     f"Error processing {segment_type} segment: {str(e)}"
@@ -142,11 +195,31 @@ class Audio:
 
         return processed_segments, exceeds_duration
 
+    def _get_speech_timeline(self, processed_segments):
+        """Return where each segment and its speech start and end in the final audio."""
+        timeline = []
+        start = 0
+        for segment, (initial_silence, speech_duration) in zip(
+            processed_segments, self.speech_spans
+        ):
+            speech_start = start + initial_silence
+            timeline.append(
+                {
+                    "start": start,
+                    "speech_start": speech_start,
+                    "speech_end": speech_start + speech_duration,
+                    "end": start + len(segment),
+                }
+            )
+            start += len(segment)
+        return timeline
+
     def _validate_audio(self, final_audio, processed_segments):
+        # Only the intro/outro slots the format actually has are counted
         expected_duration = (
-            self.intro_duration
-            + self.video_segment_duration * (len(processed_segments) - 2)
-            + self.outro_duration
+            self.expected_duration
+            if self.expected_duration is not None
+            else sum(self.slot_durations)
         )
         final_audio_duration = len(final_audio)
 
@@ -159,18 +232,7 @@ class Audio:
                 )
             )
 
-        segment_durations = {
-            "intro": self.intro_duration,
-            "content": self.video_segment_duration,
-            "outro": self.outro_duration,
-        }
-
-        for segment, duration in zip(
-            processed_segments,
-            [segment_durations["intro"]]
-            + [segment_durations["content"]] * (len(processed_segments) - 2)
-            + [segment_durations["outro"]],
-        ):
+        for segment, duration in zip(processed_segments, self.slot_durations):
             if len(segment) > duration:
                 exceptions.append(
                     DurationExceededError(
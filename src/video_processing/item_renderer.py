@@ -0,0 +1,273 @@
+import asyncio
+import os
+
+from utils.codec import decode
+from utils.exceptions import DurationExceededError
+from utils.progressive_export import MANIFEST_NAME, get_progressive_dir
+from utils.scheduler import find_format
+from video_formats.quiz_format import QuizFormat
+from video_formats.wyr_format import WYRFormat
+from video_processing.audio_processor2 import Audio
+from video_processing.music_bed import MusicBed
+from video_processing.text_to_speech import TextToSpeech
+
+CONFIG_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, "config"
+)
+
+OUTRO_TEXT = "Like and subscribe or don't, Who cares!"
+OUTRO_LANGUAGE = "en"  # The outro is always English
+
+# Directory collecting every final audio of a format
+ALL_VIDEOS_DIRS = {"quiz": "all_quizzes", "wyr": "all_wyr"}
+
+
+class RenderPlan:
+    """Work shared by every language of an item, done once before the fan-out."""
+
+    def __init__(self, name, video_format, export_dirs, shared_segments, errors=None):
+        self.name = name
+        self.video_format = video_format
+        self.config = video_format.get_config()
+        self.export_dirs = export_dirs
+        self.shared_segments = shared_segments
+        self.errors = errors if errors else []  # Failures every language shares
+
+
+class ItemRenderer:
+    """Render input items while keeping configs and TTS state loaded between items."""
+
+    def __init__(
+        self,
+        output_root=".",
+        config_path=os.path.join(CONFIG_DIR, "config.json"),
+        format_config_path=os.path.join(CONFIG_DIR, "video_format.json"),
+    ):
+        self.output_root = output_root
+        self.text_to_speech = TextToSpeech(config_path)
+        self.config = self.text_to_speech.config
+        self.music_bed = self._create_music_bed()
+
+        progressive_config = self.config.get("audio", {}).get("progressive_export", {})
+        self.chunk_duration = (
+            progressive_config.get("chunk_duration", 5000)
+            if progressive_config.get("enabled", False)
+            else None
+        )
+        self.formats = {
+            QuizFormat.format_name: QuizFormat(format_config_path),
+            WYRFormat.format_name: WYRFormat(format_config_path),
+        }
+        self._shared_segments = {}  # (text, language code) -> decoded segment
+
+    def _create_music_bed(self):
+        """Create the music bed described in the "audio" config section."""
+        music_bed_config = self.config.get("audio", {}).get("music_bed", {})
+        if not music_bed_config.get("path"):
+            return None
+
+        return MusicBed(
+            music_bed_config["path"],
+            music_gain_db=music_bed_config.get("music_gain_db", -14),
+            duck_gain_db=music_bed_config.get("duck_gain_db", -26),
+            attack_ms=music_bed_config.get("attack_ms", 150),
+            release_ms=music_bed_config.get("release_ms", 400),
+        )
+
+    async def close(self):
+        await self.text_to_speech.close()
+
+    def cache_bytes(self):
+        """Return the bytes held by the decoded segments kept between items."""
+        cache_bytes = sum(
+            len(segment.raw_data) for segment in list(self._shared_segments.values())
+        )
+        if self.music_bed:
+            cache_bytes += self.music_bed.cache_bytes()
+        return cache_bytes
+
+    def get_wyr_joiner(self, language_code):
+        """Retrieve the word joining the two options of a WYR question."""
+        return self.config.get("wyr_joiners", {}).get(language_code, None)
+
+    def get_language_name(self, language_code):
+        """Retrieve the display name of a language, defaulting to its code."""
+        return self.config.get("language_names", {}).get(language_code, language_code)
+
+    def get_format(self, name):
+        """Return the video format matching the item name."""
+        video_format = find_format(name, self.formats)
+        if not video_format:
+            raise ValueError(f"Unexpected item name format: {name}")
+        return video_format
+
+    def validate_item(self, item):
+        """Raise ValueError if the item does not follow the input file schema."""
+        if not isinstance(item, dict):
+            raise ValueError(f"Invalid item data: {item}")
+
+        name = item.get("name")
+        content = item.get("content")
+        if not name or not content or not isinstance(content, dict):
+            raise ValueError(f"Invalid item data: {item}")
+
+        for language_code, lines in content.items():
+            if (
+                not isinstance(lines, list)
+                or not lines
+                or not all(isinstance(line, str) and line.strip() for line in lines)
+            ):
+                raise ValueError(
+                    f"Invalid lines for language {language_code} in {name}: expected a non-empty list of non-blank strings"
+                )
+
+        self.get_format(name)
+
+    def build_lines(self, video_format, lines, language_code):
+        """Turn the raw input lines into the lines read by the TTS."""
+        if video_format.format_name != WYRFormat.format_name:
+            return lines
+
+        if len(lines) % 2 != 0:
+            raise ValueError("Odd number of lines in WYR data. Lines should be even.")
+
+        joiner = self.get_wyr_joiner(language_code)
+        if not joiner:
+            raise ValueError(f"No WYR joiner found for language code {language_code}")
+
+        return [f"{lines[i]}, {joiner} {lines[i+1]}" for i in range(0, len(lines), 2)]
+
+    def build_data(self, video_format, lines):
+        """Split the lines into the intro and content sections."""
+        data = {}
+        if video_format.intro_duration > 0:
+            data["intro"] = lines[:1]
+            lines = lines[1:]
+        data["content"] = lines
+        return data
+
+    async def get_shared_segment(self, text, language_code):
+        """Synthesize and decode a segment once for every item and language."""
+        key = (text, language_code)
+        if key not in self._shared_segments:
+            audio_stream = await self.text_to_speech.tts_to_memory(text, language_code)
+            self._shared_segments[key] = await asyncio.to_thread(
+                decode, audio_stream, format="mp3"
+            )
+        return self._shared_segments[key]
+
+    async def plan_item(self, item):
+        """Prepare the format, export directories and language-independent segments."""
+        name = item["name"]
+        video_format = self.get_format(name)
+
+        shared_segments = {}
+        errors = []
+        if video_format.outro_duration > 0:
+            # Reported by every language instead of failing the whole item
+            try:
+                shared_segments["outro"] = [
+                    await self.get_shared_segment(OUTRO_TEXT, OUTRO_LANGUAGE)
+                ]
+            except Exception as e:
+                errors.append(f"Error generating the outro: {e}")
+
+        return RenderPlan(
+            name,
+            video_format,
+            self.get_export_dirs(video_format, name),
+            shared_segments,
+            errors,
+        )
+
+    def get_export_dirs(self, video_format, name):
+        video_dir = os.path.join(self.output_root, video_format.format_name, name)
+        all_videos_dir = os.path.join(
+            self.output_root,
+            video_format.format_name,
+            ALL_VIDEOS_DIRS[video_format.format_name],
+        )
+        os.makedirs(video_dir, exist_ok=True)
+        os.makedirs(all_videos_dir, exist_ok=True)
+        return [video_dir, all_videos_dir]
+
+    def get_output_files(self, name, language_code, export_dirs):
+        """Return the final audio files, or manifests for progressive exports."""
+        if self.chunk_duration:
+            return [
+                os.path.join(
+                    get_progressive_dir(dir_path, name, language_code), MANIFEST_NAME
+                )
+                for dir_path in export_dirs
+            ]
+        return [
+            os.path.join(dir_path, f"{name}_final_{language_code}.mp3")
+            for dir_path in export_dirs
+        ]
+
+    async def render_item(self, item, progress_callback=None):
+        """
+        Render every language of an item.
+
+        The item is planned once, then only the speech of each language is
+        synthesized, assembled and exported. Errors are reported per language
+        so one failing language does not prevent the others from being
+        rendered. progress_callback, if given, is called with
+        (languages_done, languages_total) after each language.
+        """
+        self.validate_item(item)
+        plan = await self.plan_item(item)
+
+        content = item["content"]
+        results = {}
+        for index, (language_code, lines) in enumerate(content.items()):
+            results[language_code] = await self.render_language(
+                plan, language_code, lines
+            )
+            if progress_callback:
+                progress_callback(index + 1, len(content))
+
+        return results
+
+    async def render_language(self, plan, language_code, lines):
+        if plan.errors:
+            return {"status": "error", "message": "\n".join(plan.errors)}
+
+        try:
+            # Blank lines are skipped, as the legacy audio processor did
+            lines = [line.strip() for line in lines if line.strip()]
+            if not lines:
+                raise ValueError("No valid lines found in the input file.")
+
+            lines = self.build_lines(plan.video_format, lines, language_code)
+            data = self.build_data(plan.video_format, lines)
+            if not data["content"]:
+                raise ValueError(
+                    f"No content lines found for {plan.name} in {language_code}."
+                )
+            audio = Audio(
+                plan.name,
+                data,
+                plan.config,
+                plan.export_dirs,
+                text_to_speech=self.text_to_speech,
+                music_bed=self.music_bed,
+                chunk_duration=self.chunk_duration,
+                shared_segments=plan.shared_segments,
+                expected_duration=plan.video_format.get_total_duration(
+                    len(data["content"])
+                ),
+            )
+            await audio.process_audio(
+                plan.export_dirs[0], language_code, plan.export_dirs
+            )
+            result = {"status": "done"}
+        except DurationExceededError as e:
+            result = {"status": "warning", "message": str(e)}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+        result["files"] = self.get_output_files(
+            plan.name, language_code, plan.export_dirs
+        )
+        return result
@@ -0,0 +1,130 @@
+import argparse
+import asyncio
+import re
+
+from aiohttp import WSMsgType, web
+
+# A silent MPEG-2 Layer III frame (24 kHz, 48 kbit/s, mono), the same audio
+# format edge-tts returns. Each frame holds 24 ms of audio.
+SILENT_MP3_FRAME = bytes([0xFF, 0xF3, 0x64, 0xC0]) + bytes(140)
+FRAMES_PER_CHARACTER = 3
+
+PROSODY_TEXT = re.compile(r"<prosody[^>]*>(.*)</prosody>", re.DOTALL)
+
+
+def _headers(message):
+    header_end = message.find("\r\n\r\n")
+    headers = {}
+    for line in message[:header_end].split("\r\n"):
+        key, value = line.split(":", 1)
+        headers[key] = value
+    return headers
+
+
+def _audio_message(request_id, data):
+    header = (
+        f"X-RequestId:{request_id}\r\n" "Content-Type:audio/mpeg\r\n" "Path:audio\r\n"
+    ).encode("utf-8")
+    return len(header).to_bytes(2, "big") + header + data
+
+
+class MockTTSServer:
+    """
+    Local stand-in for the edge-tts websocket so the connection pool can be
+    exercised offline.
+
+    Every SSML turn is answered with silent MP3 audio whose length grows with
+    the text. close_after_turns makes the server drop a connection after that
+    many turns, to exercise reconnects.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, close_after_turns=None):
+        self.host = host
+        self.port = port
+        self.close_after_turns = close_after_turns
+        self.connections = 0
+        self.turns = 0
+        self._runner = None
+        self._websockets = set()
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/edge/v1?TrustedClientToken=mock"
+
+    async def start(self):
+        app = web.Application()
+        app.add_routes([web.get("/edge/v1", self._handle_websocket)])
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self.port = self._runner.addresses[0][1]
+        return self.url
+
+    async def stop(self):
+        # Drop open connections first, as a restarted service would
+        for websocket in list(self._websockets):
+            await websocket.close()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_websocket(self, request):
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+        self.connections += 1
+        self._websockets.add(websocket)
+        try:
+            await self._serve_turns(websocket)
+        finally:
+            self._websockets.discard(websocket)
+
+        await websocket.close()
+        return websocket
+
+    async def _serve_turns(self, websocket):
+        turns = 0
+        async for message in websocket:
+            if message.type != WSMsgType.TEXT:
+                continue
+
+            headers = _headers(message.data)
+            if headers.get("Path") != "ssml":
+                continue
+
+            request_id = headers.get("X-RequestId", "")
+            text = PROSODY_TEXT.search(message.data)
+            num_frames = FRAMES_PER_CHARACTER * len(text.group(1) if text else "") + 1
+            await websocket.send_str(
+                f"X-RequestId:{request_id}\r\nPath:turn.start\r\n\r\n{{}}"
+            )
+            await websocket.send_bytes(
+                _audio_message(
+                    request_id,
+                    SILENT_MP3_FRAME * num_frames,
+                )
+            )
+            await websocket.send_str(
+                f"X-RequestId:{request_id}\r\nPath:turn.end\r\n\r\n{{}}"
+            )
+
+            turns += 1
+            self.turns += 1
+            if self.close_after_turns and turns >= self.close_after_turns:
+                break
+
+
+async def _serve(host, port):
+    server = MockTTSServer(host, port)
+    print(f"Mock TTS server listening on {await server.start()}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the mock edge-tts server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+    asyncio.run(_serve(args.host, args.port))
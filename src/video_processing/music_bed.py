@@ -0,0 +1,121 @@
+import os
+
+import numpy as np
+from utils.codec import decode
+from utils.exceptions import AudioProcessingError
+
+# Decoded tracks kept per MusicBed, e.g. for speech at two frame rates
+MUSIC_CACHE_SIZE = 2
+
+# Frames mixed at a time, bounding the float copies made by the mix
+MIX_BLOCK_FRAMES = 65536
+
+
+def _load_music_samples(music_path, frame_rate, channels):
+    """Decode a music file to 16-bit samples matching the speech format."""
+    music = decode(music_path)
+    music = music.set_frame_rate(frame_rate).set_channels(channels)
+    music = music.set_sample_width(2)
+    samples = np.frombuffer(music.raw_data, dtype=np.int16).reshape(-1, channels)
+    if not len(samples):
+        raise AudioProcessingError(f"Music file {music_path} has no audio.")
+    return samples
+
+
+class MusicBed:
+    """
+    Loop a music track under the speech and duck it while speech plays.
+
+    The gain envelope is built from the speech timeline of the final audio,
+    where each entry holds the time its speech starts and ends. The music
+    is scaled and added to the speech with numpy, one block at a time.
+    """
+
+    def __init__(
+        self,
+        music_path,
+        music_gain_db=-14,
+        duck_gain_db=-26,
+        attack_ms=150,
+        release_ms=400,
+    ):
+        if not os.path.exists(music_path):
+            raise FileNotFoundError(f"Music file not found at {music_path}")
+
+        self.music_path = music_path
+        self.music_gain_db = music_gain_db
+        self.duck_gain_db = duck_gain_db
+        self.attack_ms = attack_ms
+        self.release_ms = release_ms
+        self._music = {}  # (modified time, frame rate, channels) -> samples
+
+    def build_envelope(self, duration_ms, timeline):
+        """Return the music gain for every millisecond of the track."""
+        times = np.arange(duration_ms, dtype=np.float32)
+        ducking = np.zeros(duration_ms, dtype=np.float32)
+
+        for segment in timeline:
+            # Ramp down before the speech starts and back up once it has ended
+            ramp_in = (times - (segment["speech_start"] - self.attack_ms)) / max(
+                self.attack_ms, 1
+            )
+            ramp_out = ((segment["speech_end"] + self.release_ms) - times) / max(
+                self.release_ms, 1
+            )
+            np.maximum(
+                ducking,
+                np.clip(np.minimum(ramp_in, ramp_out), 0, 1),
+                out=ducking,
+            )
+
+        gain_db = self.music_gain_db + ducking * (
+            self.duck_gain_db - self.music_gain_db
+        )
+        return np.power(10, gain_db / 20, dtype=np.float32)
+
+    def cache_bytes(self):
+        """Return the bytes held by the decoded music cache."""
+        return sum(samples.nbytes for samples in list(self._music.values()))
+
+    def _get_music_samples(self, frame_rate, channels):
+        """
+        Return the decoded music, cached across videos. The modified time is
+        part of the key so an edited file is decoded again.
+        """
+        key = (os.path.getmtime(self.music_path), frame_rate, channels)
+        if key not in self._music:
+            samples = _load_music_samples(self.music_path, frame_rate, channels)
+            while len(self._music) >= MUSIC_CACHE_SIZE:
+                self._music.pop(next(iter(self._music)), None)
+            self._music[key] = samples
+        return self._music[key]
+
+    def mix(self, speech, timeline):
+        """Return speech with the ducked music bed mixed under it."""
+        speech = speech.set_sample_width(2)
+        channels = speech.channels
+        frame_rate = speech.frame_rate
+
+        music = self._get_music_samples(frame_rate, channels)
+
+        samples = np.frombuffer(speech.raw_data, dtype=np.int16).reshape(-1, channels)
+        num_frames = len(samples)
+        if not num_frames:
+            return speech
+
+        duration_ms = int(np.ceil(num_frames * 1000 / frame_rate))
+        envelope = self.build_envelope(duration_ms, timeline)
+        envelope_times = np.arange(duration_ms)
+
+        mixed = np.empty_like(samples)
+        for start in range(0, num_frames, MIX_BLOCK_FRAMES):
+            end = min(start + MIX_BLOCK_FRAMES, num_frames)
+            frames = np.arange(start, end)
+            # Stretch the per-ms envelope to frames and loop the music
+            gain = np.interp(frames * (1000 / frame_rate), envelope_times, envelope)
+            block = music[frames % len(music)] * gain[:, np.newaxis]
+            block += samples[start:end]
+            np.clip(block, -32768, 32767, out=block)
+            mixed[start:end] = block
+
+        return speech._spawn(mixed.tobytes())
@@ -3,15 +3,18 @@ import json
 import os
 
 import edge_tts
+from edge_tts.constants import WSS_URL
 
-from ..utils.json_exceptions import JSONConfigurationError, JSONWarning
+from utils.json_exceptions import JSONConfigurationError, JSONWarning
+from video_processing.tts_pool import TTSConnectionPool
 
 
 class TextToSpeech:
 
-    def __init__(self, config_path="../../config/config.json"):
+    def __init__(self, config_path="../../config/config.json", pool=None):
         self.config_path = config_path
         self.load_config()
+        self.pool = pool if pool else self._create_pool()
 
     def load_config(self):
         if not os.path.exists(self.config_path):
@@ -27,6 +30,19 @@ class TextToSpeech:
                 f"Error parsing the configuration file: {str(e)}"
             )
 
+    def _create_pool(self):
+        """Create the connection pool described in the "tts" config section."""
+        pool_config = self.config.get("tts", {}).get("pool", {})
+        if not pool_config.get("enabled", False):
+            return None
+
+        return TTSConnectionPool(
+            url=pool_config.get("url") or WSS_URL,
+            max_connections_per_voice=pool_config.get("max_connections_per_voice", 4),
+            idle_timeout=pool_config.get("idle_timeout", 60),
+            health_check_interval=pool_config.get("health_check_interval", 15),
+        )
+
     def get_voice(self, language_code):
         """Retrieve the voice setting for a given language code."""
         return self.config.get("voices", {}).get(language_code, None)
@@ -36,10 +52,16 @@ class TextToSpeech:
         if not voice:
             raise ValueError(f"No voice found for language code {language_code}")
 
+        if self.pool:
+            return io.BytesIO(await self.pool.synthesize(text, voice))
+
         audio_stream = io.BytesIO()
 
+        # Communicate.save only accepts file paths, so collect the stream
         communicate = edge_tts.Communicate(text, voice)
-        await communicate.save(audio_stream)
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                audio_stream.write(chunk["data"])
 
         audio_stream.seek(
             0
@@ -52,5 +74,16 @@ class TextToSpeech:
         if not voice:
             raise ValueError(f"No voice found for language code {language_code}")
 
+        if self.pool:
+            audio = await self.pool.synthesize(text, voice)
+            with open(output_file, "wb") as file:
+                file.write(audio)
+            return
+
         communicate = edge_tts.Communicate(text, voice)
         await communicate.save(output_file)
+
+    async def close(self):
+        """Close the pooled connections, if any."""
+        if self.pool:
+            await self.pool.close()
@@ -0,0 +1,315 @@
+import asyncio
+import ssl
+import time
+from collections import deque
+from xml.sax.saxutils import escape
+
+import aiohttp
+import certifi
+from edge_tts.communicate import (
+    calc_max_mesg_size,
+    connect_id,
+    date_to_string,
+    get_headers_and_data,
+    mkssml,
+    remove_incompatible_characters,
+    split_text_by_byte_length,
+    ssml_headers_plus_data,
+)
+from edge_tts.constants import WSS_URL
+from edge_tts.models import TTSConfig
+from utils.exceptions import TTSConnectionError
+
+# Same headers edge_tts.Communicate sends when opening the websocket
+WSS_HEADERS = {
+    "Pragma": "no-cache",
+    "Cache-Control": "no-cache",
+    "Origin": "chrome-extension://jdiccldimpdaibmpdkjnbmckianbfold",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Accept-Language": "en-US,en;q=0.9",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    " (KHTML, like Gecko) Chrome/91.0.4472.77 Safari/537.36 Edg/91.0.864.41",
+}
+
+SPEECH_CONFIG = (
+    "Content-Type:application/json; charset=utf-8\r\n"
+    "Path:speech.config\r\n\r\n"
+    '{"context":{"synthesis":{"audio":{"metadataoptions":{'
+    '"sentenceBoundaryEnabled":false,"wordBoundaryEnabled":false},'
+    '"outputFormat":"audio-24khz-48kbitrate-mono-mp3"'
+    "}}}}\r\n"
+)
+
+
+class TTSConnection:
+    """A websocket to the edge-tts service that is reused for many lines."""
+
+    def __init__(self, websocket, receive_timeout):
+        self.websocket = websocket
+        self.receive_timeout = receive_timeout
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.last_checked = self.created_at
+
+    @property
+    def closed(self):
+        return self.websocket.closed
+
+    async def send_speech_config(self):
+        await self.websocket.send_str(
+            f"X-Timestamp:{date_to_string()}\r\n{SPEECH_CONFIG}"
+        )
+
+    async def synthesize(self, tts_config, text):
+        """Run one SSML turn per text chunk and return the MP3 bytes."""
+        audio = bytearray()
+        for partial_text in split_text_by_byte_length(
+            escape(remove_incompatible_characters(text)),
+            calc_max_mesg_size(tts_config),
+        ):
+            audio += await self._run_turn(tts_config, partial_text)
+        self.last_used = time.monotonic()
+        return bytes(audio)
+
+    async def _run_turn(self, tts_config, partial_text):
+        await self.websocket.send_str(
+            ssml_headers_plus_data(
+                connect_id(), date_to_string(), mkssml(tts_config, partial_text)
+            )
+        )
+
+        audio = bytearray()
+        while True:
+            received = await asyncio.wait_for(
+                self.websocket.receive(), self.receive_timeout
+            )
+
+            if received.type == aiohttp.WSMsgType.TEXT:
+                encoded_data = received.data.encode("utf-8")
+                parameters, _ = get_headers_and_data(
+                    encoded_data, encoded_data.find(b"\r\n\r\n")
+                )
+                if parameters.get(b"Path") == b"turn.end":
+                    break
+            elif received.type == aiohttp.WSMsgType.BINARY:
+                header_length = int.from_bytes(received.data[:2], "big")
+                parameters, data = get_headers_and_data(received.data, header_length)
+                if parameters.get(b"Path") == b"audio" and parameters.get(
+                    b"Content-Type"
+                ):
+                    audio += data
+            elif received.type == aiohttp.WSMsgType.PING:
+                await self.websocket.pong(received.data)
+            elif received.type != aiohttp.WSMsgType.PONG:
+                raise TTSConnectionError(
+                    f"Connection closed while waiting for audio: {received.type.name}"
+                )
+
+        if not audio:
+            raise TTSConnectionError("No audio was received from the TTS service.")
+        return audio
+
+    async def ping(self, timeout):
+        """Return True if the connection answers a websocket ping within timeout."""
+        if self.closed:
+            return False
+        try:
+            healthy = await asyncio.wait_for(self._wait_for_pong(), timeout)
+        except (asyncio.TimeoutError, aiohttp.ClientError, ConnectionError):
+            return False
+        if healthy:
+            self.last_checked = time.monotonic()
+        return healthy
+
+    async def _wait_for_pong(self):
+        # Connections are opened with autoping=False so pongs reach us here
+        await self.websocket.ping()
+        while True:
+            received = await self.websocket.receive()
+            if received.type == aiohttp.WSMsgType.PONG:
+                return True
+            if received.type == aiohttp.WSMsgType.PING:
+                await self.websocket.pong(received.data)
+            elif received.type not in (
+                aiohttp.WSMsgType.TEXT,
+                aiohttp.WSMsgType.BINARY,
+            ):
+                return False
+
+    async def close(self):
+        await self.websocket.close()
+
+
+class TTSConnectionPool:
+    """
+    Warm edge-tts websockets shared by every video using the same TextToSpeech.
+
+    Each voice keeps up to max_connections_per_voice connections. Idle
+    connections are pinged before reuse once health_check_interval has
+    passed and closed after idle_timeout seconds without use.
+    """
+
+    def __init__(
+        self,
+        url=WSS_URL,
+        max_connections_per_voice=4,
+        idle_timeout=60,
+        health_check_interval=15,
+        connect_timeout=10,
+        receive_timeout=60,
+    ):
+        self.url = url
+        self.max_connections_per_voice = max_connections_per_voice
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.connect_timeout = connect_timeout
+        self.receive_timeout = receive_timeout
+        self._reset()
+
+    def _reset(self):
+        self._loop = None
+        self._session = None
+        self._reaper = None
+        self._idle = {}  # voice -> deque of idle TTSConnection
+        self._limits = {}  # voice -> Semaphore bounding open connections
+        self.stats = {"opened": 0, "reused": 0, "evicted": 0}
+
+    def _ensure_loop(self):
+        # aiohttp sessions and websockets are bound to the loop they were
+        # created in and can only be closed from it, so a pool serves one
+        # loop until close() is awaited there.
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None:
+            raise TTSConnectionError(
+                "TTSConnectionPool is already used by another event loop; "
+                "await close() in that loop before using it in a new one."
+            )
+
+        self._loop = loop
+        self._session = aiohttp.ClientSession(
+            trust_env=True,
+            timeout=aiohttp.ClientTimeout(
+                total=None, sock_connect=self.connect_timeout
+            ),
+        )
+        self._reaper = loop.create_task(self._evict_idle_periodically())
+
+    async def synthesize(self, text, voice):
+        """Synthesize text with a pooled connection, retrying once on a new one."""
+        tts_config = TTSConfig(voice, "+0%", "+0%", "+0Hz")
+        for attempt in range(2):
+            connection = await self._acquire(voice, reuse=not attempt)
+            try:
+                audio = await connection.synthesize(tts_config, text)
+            except (TTSConnectionError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                await self._discard(voice, connection)
+                if attempt:
+                    raise TTSConnectionError(f"TTS request failed for {voice}: {e}")
+                continue
+            except BaseException:
+                await self._discard(voice, connection)
+                raise
+            self._release(voice, connection)
+            return audio
+
+    async def _acquire(self, voice, reuse=True):
+        self._ensure_loop()
+        limit = self._limits.setdefault(
+            voice, asyncio.Semaphore(self.max_connections_per_voice)
+        )
+        await limit.acquire()
+
+        idle = self._idle.setdefault(voice, deque())
+        try:
+            while reuse and idle:
+                connection = idle.pop()
+                if await self._is_healthy(connection):
+                    self.stats["reused"] += 1
+                    return connection
+                await self._close(connection)
+            return await self._open()
+        except BaseException:
+            limit.release()
+            raise
+
+    def _release(self, voice, connection):
+        self._idle[voice].append(connection)
+        self._limits[voice].release()
+
+    async def _discard(self, voice, connection):
+        await self._close(connection)
+        self._limits[voice].release()
+
+    async def _open(self):
+        ssl_ctx = ssl.create_default_context(cafile=certifi.where())
+        try:
+            websocket = await self._session.ws_connect(
+                f"{self.url}&ConnectionId={connect_id()}",
+                compress=15,
+                autoping=False,
+                headers=WSS_HEADERS,
+                ssl=ssl_ctx,
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise TTSConnectionError(f"Could not connect to the TTS service: {e}")
+
+        connection = TTSConnection(websocket, self.receive_timeout)
+        await connection.send_speech_config()
+        self.stats["opened"] += 1
+        return connection
+
+    async def _is_healthy(self, connection):
+        if connection.closed:
+            return False
+        now = time.monotonic()
+        if now - connection.last_used > self.idle_timeout:
+            return False
+        if now - connection.last_checked > self.health_check_interval:
+            return await connection.ping(self.connect_timeout)
+        return True
+
+    async def _close(self, connection):
+        try:
+            await connection.close()
+        except Exception:
+            pass
+
+    async def evict_idle(self):
+        """Close every idle connection unused for longer than idle_timeout."""
+        # Lines for new voices may be acquired while closing, so work on a
+        # snapshot and only take connections nobody acquired meanwhile
+        now = time.monotonic()
+        expired = [
+            (idle, connection)
+            for _, idle in list(self._idle.items())
+            for connection in list(idle)
+            if connection.closed or now - connection.last_used > self.idle_timeout
+        ]
+
+        evicted = []
+        for idle, connection in expired:
+            if connection in idle:
+                idle.remove(connection)
+                self.stats["evicted"] += 1
+                evicted.append(connection)
+
+        for connection in evicted:
+            await self._close(connection)
+
+    async def _evict_idle_periodically(self):
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, self.health_check_interval))
+            await self.evict_idle()
+
+    async def close(self):
+        """Close all idle connections and the underlying session."""
+        if self._reaper:
+            self._reaper.cancel()
+        for idle in list(self._idle.values()):
+            while idle:
+                await self._close(idle.pop())
+        if self._session:
+            await self._session.close()
+        self._reset()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The sources are imported from src, as main.py and daemon.py do
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
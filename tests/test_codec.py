@@ -0,0 +1,80 @@
+import io
+import shutil
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+from utils import codec
+from utils.codec import decode, encode_mp3, export_mp3
+
+
+def tone(duration, frame_rate, channels):
+    times = np.arange(frame_rate * duration // 1000)
+    samples = (np.sin(times * 2 * np.pi * 440 / frame_rate) * 8000).astype(np.int16)
+    return AudioSegment(
+        np.repeat(samples, channels).tobytes(),
+        frame_rate=frame_rate,
+        sample_width=2,
+        channels=channels,
+    )
+
+
+@pytest.mark.parametrize("frame_rate, channels", [(24_000, 1), (44_100, 2)])
+def test_mp3_round_trip(frame_rate, channels):
+    audio = tone(3210, frame_rate, channels)
+
+    decoded = decode(io.BytesIO(encode_mp3(audio)), format="mp3")
+
+    assert len(decoded) == len(audio)
+    assert decoded.channels == channels
+    assert decoded.frame_rate == frame_rate
+    assert decoded.sample_width == 2
+
+
+def test_export_mp3_writes_every_path(tmp_path):
+    audio = tone(1000, 24_000, 1)
+    paths = [str(tmp_path / "a.mp3"), str(tmp_path / "b.mp3")]
+
+    data = export_mp3(audio, paths)
+
+    for path in paths:
+        with open(path, "rb") as file:
+            assert file.read() == data
+        assert len(decode(path)) == len(audio)
+
+
+def test_invalid_input_raises_value_error():
+    with pytest.raises(ValueError):
+        decode(io.BytesIO(b"not audio at all" * 64), format="mp3")
+
+
+def test_falls_back_to_pydub_without_av(monkeypatch):
+    calls = []
+
+    def from_file(source, format=None):
+        calls.append(("from_file", format))
+        return AudioSegment.silent(duration=100)
+
+    def export(audio, output, format=None, bitrate=None):
+        calls.append(("export", format, bitrate))
+        output.write(b"mp3 data")
+
+    monkeypatch.setattr(codec, "av", None)
+    monkeypatch.setattr(AudioSegment, "from_file", staticmethod(from_file))
+    monkeypatch.setattr(AudioSegment, "export", export)
+
+    assert len(decode("audio.mp3", format="mp3")) == 100
+    assert encode_mp3(AudioSegment.silent(duration=100)) == b"mp3 data"
+    assert calls == [("from_file", "mp3"), ("export", "mp3", "128k")]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="pydub needs ffmpeg")
+def test_pydub_fallback_round_trip(monkeypatch):
+    monkeypatch.setattr(codec, "av", None)
+    audio = tone(1000, 24_000, 1)
+
+    decoded = decode(io.BytesIO(encode_mp3(audio)), format="mp3")
+
+    assert abs(len(decoded) - len(audio)) < 100
+    assert decoded.frame_rate == 24_000
@@ -0,0 +1,168 @@
+import asyncio
+import io
+import os
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from daemon import RenderDaemon
+from utils.memory_governor import MemoryGovernor
+from video_processing.item_renderer import ItemRenderer
+from video_processing.mock_tts_server import SILENT_MP3_FRAME
+
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "config")
+
+QUIZ = {"name": "quiz_1", "content": {"en": ["intro", "q1"], "pt": ["intro", "p1"]}}
+
+
+class FakeTTS:
+    """Answer every line with 240 ms of silent MP3, once released."""
+
+    def __init__(self):
+        self.released = asyncio.Event()
+        self.released.set()
+
+    async def tts_to_memory(self, text, language_code):
+        await self.released.wait()
+        return io.BytesIO(SILENT_MP3_FRAME * 10)
+
+    async def close(self):
+        pass
+
+
+class FakeLogger:
+    def __init__(self):
+        self.errors = []
+
+    def log_error(self, message):
+        self.errors.append(message)
+
+
+def run_with_client(tmp_path, test):
+    """Run test(client, tts) against a daemon with one worker and a fake TTS."""
+
+    async def run():
+        renderer = ItemRenderer(
+            str(tmp_path),
+            os.path.join(CONFIG_DIR, "config.json"),
+            os.path.join(CONFIG_DIR, "video_format.json"),
+        )
+        tts = FakeTTS()
+        renderer.text_to_speech = tts
+        daemon = RenderDaemon(
+            renderer, FakeLogger(), MemoryGovernor(1 << 30), workers=1
+        )
+        async with TestClient(TestServer(daemon.create_app())) as client:
+            return await test(client, tts)
+
+    return asyncio.run(run())
+
+
+async def submit(client, payload):
+    response = await client.post("/jobs", json=payload)
+    assert response.status == 202
+    return [job["id"] for job in await response.json()]
+
+
+async def wait_until_finished(client, job_id):
+    for _ in range(500):
+        job = await (await client.get(f"/jobs/{job_id}")).json()
+        if job["status"] not in ("queued", "running"):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_invalid_requests_are_rejected(tmp_path):
+    async def test(client, tts):
+        invalid_json = await client.post("/jobs", data="{not json")
+        invalid_priority = await client.post("/jobs", json=dict(QUIZ, priority="high"))
+        invalid_lines = await client.post(
+            "/jobs", json={"name": "quiz_1", "content": {"en": "Hello"}}
+        )
+        unknown_job = await client.get("/jobs/42")
+        unknown_result = await client.get("/jobs/42/result")
+        jobs = await (await client.get("/jobs")).json()
+        return [
+            invalid_json.status,
+            invalid_priority.status,
+            invalid_lines.status,
+            unknown_job.status,
+            unknown_result.status,
+            jobs,
+        ]
+
+    assert run_with_client(tmp_path, test) == [400, 400, 400, 404, 404, []]
+
+
+def test_result_conflicts_until_the_job_finishes(tmp_path):
+    async def test(client, tts):
+        tts.released.clear()
+        running, queued = await submit(client, [QUIZ, dict(QUIZ, name="quiz_2")])
+        await asyncio.sleep(0.05)
+
+        statuses = []
+        for job_id in [running, queued]:
+            job = await (await client.get(f"/jobs/{job_id}")).json()
+            result = await client.get(f"/jobs/{job_id}/result")
+            statuses.append((job["status"], result.status))
+
+        tts.released.set()
+        await wait_until_finished(client, queued)
+        return statuses
+
+    assert run_with_client(tmp_path, test) == [
+        ("running", 409),
+        ("queued", 409),
+    ]
+
+
+def test_finished_job_reports_progress_and_results(tmp_path):
+    async def test(client, tts):
+        [job_id] = await submit(client, QUIZ)
+        job = await wait_until_finished(client, job_id)
+        result = await client.get(f"/jobs/{job_id}/result")
+        return job, result.status, await result.json()
+
+    job, status, payload = run_with_client(tmp_path, test)
+
+    assert job["status"] == "done"
+    assert job["progress"] == 1.0
+    assert job["error"] is None
+    assert status == 200
+    assert payload["status"] == "done"
+    assert list(payload["result"]) == ["en", "pt"]
+    for language_code, result in payload["result"].items():
+        assert result["status"] == "done"
+        assert result["files"] == [
+            str(tmp_path / "quiz" / "quiz_1" / f"quiz_1_final_{language_code}.mp3"),
+            str(
+                tmp_path / "quiz" / "all_quizzes" / f"quiz_1_final_{language_code}.mp3"
+            ),
+        ]
+        assert all(os.path.exists(path) for path in result["files"])
+
+
+def test_job_fails_when_every_language_fails(tmp_path):
+    async def test(client, tts):
+        [job_id] = await submit(
+            client, {"name": "wyr_1", "content": {"en": ["a", "b", "c"]}}
+        )
+        return await wait_until_finished(client, job_id)
+
+    job = run_with_client(tmp_path, test)
+
+    assert job["status"] == "failed"
+    assert job["error"].startswith("en: Odd number of lines")
+
+
+def test_job_is_partial_when_some_languages_fail(tmp_path):
+    async def test(client, tts):
+        [job_id] = await submit(
+            client, {"name": "wyr_1", "content": {"en": ["a", "b"], "xx": ["a", "b"]}}
+        )
+        return await wait_until_finished(client, job_id)
+
+    job = run_with_client(tmp_path, test)
+
+    assert job["status"] == "partial"
+    assert job["error"] == "xx: No WYR joiner found for language code xx"
@@ -0,0 +1,101 @@
+import asyncio
+import io
+import os
+
+import pytest
+
+from utils.codec import decode
+from video_processing.item_renderer import ItemRenderer
+from video_processing.mock_tts_server import SILENT_MP3_FRAME
+
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "config")
+
+
+class SilentTTS:
+    async def tts_to_memory(self, text, language_code):
+        return io.BytesIO(SILENT_MP3_FRAME * 10)
+
+    async def close(self):
+        pass
+
+
+class FailingTTS:
+    async def tts_to_memory(self, text, language_code):
+        raise ConnectionError("TTS service unreachable")
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def renderer(tmp_path):
+    return ItemRenderer(
+        str(tmp_path),
+        os.path.join(CONFIG_DIR, "config.json"),
+        os.path.join(CONFIG_DIR, "video_format.json"),
+    )
+
+
+def test_wyr_lines_are_joined_per_language(renderer):
+    wyr_format = renderer.formats["wyr"]
+
+    assert renderer.build_lines(wyr_format, ["a", "b"], "en") == ["a, or b"]
+    assert renderer.build_lines(wyr_format, ["a", "b"], "pt") == ["a, ou b"]
+    with pytest.raises(ValueError):
+        renderer.build_lines(wyr_format, ["a", "b"], "xx")
+
+
+def test_language_names_come_from_the_config(renderer):
+    assert renderer.get_language_name("pt") == "Portuguese"
+    assert renderer.get_language_name("xx") == "xx"
+
+
+def test_outro_failure_is_reported_per_language(renderer):
+    renderer.text_to_speech = FailingTTS()
+    item = {
+        "name": "quiz_1",
+        "content": {"en": ["intro", "q1"], "pt": ["intro", "p1"]},
+    }
+
+    results = asyncio.run(renderer.render_item(item))
+
+    assert list(results) == ["en", "pt"]
+    for result in results.values():
+        assert result["status"] == "error"
+        assert "Error generating the outro" in result["message"]
+
+
+@pytest.mark.parametrize(
+    "lines", ["Hello", [], ["intro", ""], ["intro", "   "], ["intro", 3], None]
+)
+def test_invalid_language_lines_are_rejected(renderer, lines):
+    with pytest.raises(ValueError):
+        renderer.validate_item({"name": "quiz_1", "content": {"en": lines}})
+
+
+def test_valid_item_is_accepted(renderer):
+    renderer.validate_item(
+        {"name": "quiz_1", "content": {"en": ["intro", "q1"], "pt": ["intro", "p1"]}}
+    )
+
+
+@pytest.mark.parametrize("lines", [[], ["  ", ""], ["intro"], ["  ", "intro "]])
+def test_language_without_content_is_an_error(renderer, lines):
+    renderer.text_to_speech = SilentTTS()
+    plan = asyncio.run(renderer.plan_item({"name": "quiz_1", "content": {}}))
+
+    result = asyncio.run(renderer.render_language(plan, "en", lines))
+
+    # No outro-only file is exported
+    assert result["status"] == "error"
+    assert not os.listdir(plan.export_dirs[0])
+
+
+def test_blank_lines_are_skipped(renderer):
+    renderer.text_to_speech = SilentTTS()
+    plan = asyncio.run(renderer.plan_item({"name": "quiz_1", "content": {}}))
+
+    result = asyncio.run(renderer.render_language(plan, "en", ["intro", " ", "q1 "]))
+
+    assert result["status"] == "done"
+    assert len(decode(result["files"][0])) == 3500 + 9500 + 3500
@@ -0,0 +1,125 @@
+import asyncio
+import os
+
+from utils.memory_governor import (
+    MIXING_PCM_COPIES,
+    MP3_BYTES_PER_MS,
+    PCM_BYTES_PER_MS,
+    PEAK_PCM_COPIES,
+    MemoryGovernor,
+    estimate_footprint,
+)
+from video_formats.quiz_format import QuizFormat
+
+
+async def run_jobs(governor, jobs, release):
+    """Start jobs in order; each holds its reservation until release[job] is set."""
+    admitted = []
+
+    async def job(job_id, num_bytes):
+        async with governor.reserve(job_id, num_bytes):
+            admitted.append(job_id)
+            await release[job_id].wait()
+
+    tasks = []
+    for job_id, num_bytes in jobs:
+        tasks.append(asyncio.create_task(job(job_id, num_bytes)))
+        await asyncio.sleep(0)  # Queue the jobs in this order
+    return admitted, tasks
+
+
+def test_jobs_are_admitted_in_arrival_order():
+    async def run():
+        governor = MemoryGovernor(100)
+        release = {job_id: asyncio.Event() for job_id in "abc"}
+        admitted, tasks = await run_jobs(
+            governor, [("a", 60), ("b", 60), ("c", 10)], release
+        )
+        await asyncio.sleep(0.01)
+
+        # c would fit next to a, but must not overtake b
+        steps = [list(admitted), governor.usage()["waiting_jobs"]]
+
+        release["a"].set()
+        await asyncio.sleep(0.01)
+        steps.append(list(admitted))
+        steps.append(governor.used_bytes)
+
+        release["b"].set()
+        release["c"].set()
+        await asyncio.gather(*tasks)
+        steps.append(governor.usage())
+        return steps
+
+    before, waiting, after, used, usage = asyncio.run(run())
+
+    assert before == ["a"]
+    assert waiting == 2
+    assert after == ["a", "b", "c"]
+    assert used == 70
+    assert usage["used_bytes"] == 0
+    assert usage["running_jobs"] == 0
+    assert usage["peak_bytes"] == 70
+
+
+def test_oversize_job_runs_alone():
+    async def run():
+        governor = MemoryGovernor(100)
+        release = {job_id: asyncio.Event() for job_id in ["a", "big", "c"]}
+        admitted, tasks = await run_jobs(
+            governor, [("a", 10), ("big", 500), ("c", 10)], release
+        )
+        await asyncio.sleep(0.01)
+        steps = [list(admitted)]
+
+        # The oversize job is admitted once nothing else is running
+        release["a"].set()
+        await asyncio.sleep(0.01)
+        steps.append(list(admitted))
+
+        release["big"].set()
+        await asyncio.sleep(0.01)
+        steps.append(list(admitted))
+
+        release["c"].set()
+        await asyncio.gather(*tasks)
+        steps.append(governor.peak_bytes)
+        return steps
+
+    assert asyncio.run(run()) == [["a"], ["a", "big"], ["a", "big", "c"], 500]
+
+
+def test_footprint_counts_the_music_mix():
+    format_config = os.path.join(
+        os.path.dirname(__file__), os.pardir, "config", "video_format.json"
+    )
+    item = {"name": "quiz_1", "content": {"en": ["intro", "q1", "q2"], "pt": ["i"]}}
+    quiz_format = QuizFormat(format_config)
+
+    duration = 3500 + 2 * 9500 + 3500
+    assert estimate_footprint(item, quiz_format) == int(
+        duration * (MP3_BYTES_PER_MS + PCM_BYTES_PER_MS * PEAK_PCM_COPIES)
+    )
+    assert estimate_footprint(item, quiz_format, mixes_music=True) == int(
+        duration * (MP3_BYTES_PER_MS + PCM_BYTES_PER_MS * MIXING_PCM_COPIES)
+    )
+
+
+def test_cache_bytes_count_against_the_budget():
+    async def run():
+        cached = {"bytes": 60}
+        governor = MemoryGovernor(100, cache_bytes=lambda: cached["bytes"])
+        release = {job_id: asyncio.Event() for job_id in "ab"}
+        admitted, tasks = await run_jobs(governor, [("a", 30), ("b", 30)], release)
+        await asyncio.sleep(0.01)
+        steps = [list(admitted), governor.usage()["cache_bytes"]]
+
+        release["a"].set()
+        await asyncio.gather(*tasks[:1])
+        cached["bytes"] = 0
+        release["b"].set()
+        await asyncio.gather(*tasks)
+        steps.append(list(admitted))
+        return steps
+
+    assert asyncio.run(run()) == [["a"], 60, ["a", "b"]]
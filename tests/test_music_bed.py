@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+from video_processing.audio_processor2 import Audio
+from video_processing.music_bed import MUSIC_CACHE_SIZE, MusicBed
+
+MUSIC_GAIN = 10 ** (-14 / 20)
+DUCK_GAIN = 10 ** (-26 / 20)
+
+SEGMENT_CONFIG = {
+    "intro_duration": 1000,
+    "outro_duration": 0,
+    "video_segment_duration": 2000,
+    "intro_initial_silence": 100,
+    "outro_initial_silence": 0,
+    "video_segment_initial_silence": 250,
+}
+
+
+@pytest.fixture
+def music_path(tmp_path):
+    # A constant signal makes the applied gain readable from the mix
+    music = AudioSegment(
+        np.full(24_000, 10_000, dtype=np.int16).tobytes(),
+        frame_rate=24_000,
+        sample_width=2,
+        channels=1,
+    )
+    path = tmp_path / "music.wav"
+    music.export(path, format="wav")
+    return str(path)
+
+
+def test_envelope_ducks_only_while_speech_plays(music_path):
+    music_bed = MusicBed(music_path, attack_ms=100, release_ms=200)
+    timeline = [{"start": 0, "speech_start": 1000, "speech_end": 1500, "end": 5000}]
+
+    envelope = music_bed.build_envelope(5000, timeline)
+
+    assert envelope[:900] == pytest.approx(MUSIC_GAIN)
+    assert envelope[1000:1501] == pytest.approx(DUCK_GAIN)
+    assert DUCK_GAIN < envelope[950] < MUSIC_GAIN
+    assert DUCK_GAIN < envelope[1600] < MUSIC_GAIN
+    # Back to full music long before the slot ends
+    assert envelope[1700:] == pytest.approx(MUSIC_GAIN)
+
+
+def test_mix_applies_the_envelope(music_path):
+    music_bed = MusicBed(music_path, attack_ms=0, release_ms=0)
+    speech = AudioSegment.silent(duration=3000, frame_rate=24_000)
+    timeline = [{"start": 0, "speech_start": 1000, "speech_end": 2000, "end": 3000}]
+
+    mixed = music_bed.mix(speech, timeline)
+    samples = np.frombuffer(mixed.raw_data, dtype=np.int16)
+
+    assert len(mixed) == len(speech)
+    assert samples[:23_000] == pytest.approx(10_000 * MUSIC_GAIN, abs=1)
+    assert samples[25_000:47_000] == pytest.approx(10_000 * DUCK_GAIN, abs=1)
+    assert samples[49_000:] == pytest.approx(10_000 * MUSIC_GAIN, abs=1)
+
+
+def test_speech_timeline_ends_with_the_speech():
+    audio = Audio(
+        "quiz_1",
+        {},
+        SEGMENT_CONFIG,
+        [],
+        text_to_speech=object(),
+    )
+    speech = {
+        "intro": [AudioSegment.silent(duration=600)],
+        "content": [
+            AudioSegment.silent(duration=700),
+            AudioSegment.silent(duration=1200),
+        ],
+    }
+
+    processed_segments = audio._process_audio_segments(speech)
+
+    assert audio._get_speech_timeline(processed_segments) == [
+        {"start": 0, "speech_start": 100, "speech_end": 700, "end": 1000},
+        {"start": 1000, "speech_start": 1250, "speech_end": 1950, "end": 3000},
+        {"start": 3000, "speech_start": 3250, "speech_end": 4450, "end": 5000},
+    ]
+
+
+def test_decoded_music_cache_is_bounded(music_path):
+    music_bed = MusicBed(music_path)
+    speech = AudioSegment.silent(duration=100, frame_rate=24_000)
+    timeline = [{"start": 0, "speech_start": 0, "speech_end": 100, "end": 100}]
+
+    for frame_rate in [24_000, 16_000, 8_000]:
+        music_bed.mix(speech.set_frame_rate(frame_rate), timeline)
+
+    assert len(music_bed._music) == MUSIC_CACHE_SIZE
+    # One second of 16-bit mono music at 16 and 8 kHz
+    assert music_bed.cache_bytes() == 2 * (16_000 + 8_000)
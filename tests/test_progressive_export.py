@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+
+import numpy as np
+from pydub import AudioSegment
+
+from utils import progressive_export
+from utils.codec import decode
+from utils.progressive_export import (
+    MANIFEST_NAME,
+    export_audio_progressive,
+    get_progressive_dir,
+    join_progressive_export,
+)
+
+
+def tone(duration, frame_rate=24_000):
+    times = np.arange(frame_rate * duration // 1000)
+    samples = np.sin(times * 2 * np.pi * 440 / frame_rate) * 8000
+    return AudioSegment(
+        samples.astype(np.int16).tobytes(),
+        frame_rate=frame_rate,
+        sample_width=2,
+        channels=1,
+    )
+
+
+def test_manifest_lists_every_chunk(tmp_path):
+    audio = tone(12345)
+
+    manifest_paths = export_audio_progressive(
+        audio, "quiz_1", [str(tmp_path / "a"), str(tmp_path / "b")], "en", 5000
+    )
+
+    for dir_path, manifest_path in zip(["a", "b"], manifest_paths):
+        output_dir = get_progressive_dir(str(tmp_path / dir_path), "quiz_1", "en")
+        assert manifest_path == os.path.join(output_dir, MANIFEST_NAME)
+
+        with open(manifest_path, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+        assert manifest["complete"]
+        assert manifest["duration"] == 12345
+        assert [chunk["duration"] for chunk in manifest["chunks"]] == [
+            5000,
+            5000,
+            2345,
+        ]
+        for chunk in manifest["chunks"]:
+            assert os.path.exists(os.path.join(output_dir, chunk["file"]))
+
+
+def test_joined_export_keeps_the_original_duration(tmp_path):
+    audio = tone(12345)
+    [manifest_path] = export_audio_progressive(
+        audio, "quiz_1", [str(tmp_path)], "en", 5000
+    )
+
+    assert len(join_progressive_export(manifest_path, timeout=1)) == len(audio)
+
+
+def test_sink_output_decodes_to_the_original_duration(tmp_path, monkeypatch):
+    audio = tone(12345)
+    [manifest_path] = export_audio_progressive(
+        audio, "quiz_1", [str(tmp_path)], "en", 5000
+    )
+    output_path = str(tmp_path / "quiz_1_en.mp3")
+
+    monkeypatch.setattr(sys, "argv", ["progressive_export", manifest_path, output_path])
+    progressive_export.main()
+
+    assert len(decode(output_path)) == len(audio)
+
+
+def test_shorter_export_removes_previous_chunks(tmp_path):
+    export_audio_progressive(tone(12345), "quiz_1", [str(tmp_path)], "en", 5000)
+    [manifest_path] = export_audio_progressive(
+        tone(4000), "quiz_1", [str(tmp_path)], "en", 5000
+    )
+
+    output_dir = os.path.dirname(manifest_path)
+    assert sorted(os.listdir(output_dir)) == ["chunk_00000.mp3", MANIFEST_NAME]
+    assert len(join_progressive_export(manifest_path, timeout=1)) == 4000
+
+
+def test_join_reports_each_chunk(tmp_path, capsys):
+    [manifest_path] = export_audio_progressive(
+        tone(12345), "quiz_1", [str(tmp_path)], "en", 5000
+    )
+    decoded = []
+
+    join_progressive_export(manifest_path, timeout=1, chunk_callback=decoded.append)
+
+    assert [os.path.basename(path) for path in decoded] == [
+        "chunk_00000.mp3",
+        "chunk_00001.mp3",
+        "chunk_00002.mp3",
+    ]
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,96 @@
+import math
+import os
+
+import pytest
+
+from utils.scheduler import schedule_items, scheduling_key
+from video_formats.quiz_format import QuizFormat
+from video_formats.wyr_format import WYRFormat
+
+FORMAT_CONFIG = os.path.join(
+    os.path.dirname(__file__), os.pardir, "config", "video_format.json"
+)
+
+
+@pytest.fixture
+def formats():
+    return {
+        QuizFormat.format_name: QuizFormat(FORMAT_CONFIG),
+        WYRFormat.format_name: WYRFormat(FORMAT_CONFIG),
+    }
+
+
+def quiz(name, questions=2, **fields):
+    lines = ["intro"] + [f"question {i}" for i in range(questions)]
+    return {"name": name, "content": {"en": lines}, **fields}
+
+
+class FakeLogger:
+    def __init__(self):
+        self.errors = []
+
+    def log_error(self, message):
+        self.errors.append(message)
+
+
+def test_scheduling_key(formats):
+    item = quiz("quiz_1", priority=2, deadline="2026-01-01T12:00:00+00:00")
+
+    priority, deadline, cost, index = scheduling_key(item, formats, 7)
+
+    assert priority == -2
+    assert deadline == 1767268800.0
+    assert cost == 3500 + 2 * 9500 + 3500
+    assert index == 7
+
+
+def test_scheduling_key_defaults(formats):
+    assert scheduling_key(quiz("quiz_1"), formats, 0)[:2] == (0, math.inf)
+
+
+def test_wyr_cost_counts_two_lines_per_segment(formats):
+    item = {"name": "wyr_1", "content": {"en": ["a", "b", "c", "d"], "pt": ["a", "b"]}}
+
+    assert scheduling_key(item, formats, 0)[2] == 2 * 9500 + 9500
+
+
+def test_schedule_items_order(formats):
+    items = [
+        quiz("quiz_long", questions=5),
+        quiz("quiz_short", questions=1),
+        quiz("quiz_late", deadline="2030-01-01T00:00:00"),
+        quiz("quiz_soon", deadline="2029-01-01T00:00:00"),
+        quiz("quiz_urgent", questions=5, priority=1),
+        quiz("quiz_tie", questions=1),
+    ]
+
+    names = [item["name"] for item in schedule_items(items, formats)]
+
+    # Priority first, then earliest deadline, then shortest job, then input order
+    assert names == [
+        "quiz_urgent",
+        "quiz_soon",
+        "quiz_late",
+        "quiz_short",
+        "quiz_tie",
+        "quiz_long",
+    ]
+
+
+def test_invalid_scheduling_fields_are_ignored_and_logged(formats):
+    logger = FakeLogger()
+    items = [
+        quiz("quiz_1", questions=3),
+        quiz("quiz_2", questions=1, priority="high"),
+        "not an item",
+    ]
+
+    scheduled = schedule_items(items, formats, logger)
+
+    assert [item if isinstance(item, str) else item["name"] for item in scheduled] == [
+        "not an item",
+        "quiz_2",
+        "quiz_1",
+    ]
+    assert len(logger.errors) == 1
+    assert "quiz_2" in logger.errors[0]
@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from utils.exceptions import TTSConnectionError
+from video_processing.mock_tts_server import SILENT_MP3_FRAME, MockTTSServer
+from video_processing.tts_pool import TTSConnectionPool
+
+VOICE = "en-US-GuyNeural"
+
+
+def expected_audio(text):
+    return SILENT_MP3_FRAME * (3 * len(text) + 1)
+
+
+async def synthesize_all(texts, close_after_turns=None, **pool_options):
+    server = MockTTSServer(close_after_turns=close_after_turns)
+    pool = TTSConnectionPool(url=await server.start(), **pool_options)
+    try:
+        audio = [await pool.synthesize(text, VOICE) for text in texts]
+    finally:
+        await pool.close()
+        await server.stop()
+    return audio, pool, server
+
+
+def test_connection_is_reused_across_lines():
+    texts = ["first line", "second", "third line!"]
+    audio, pool, server = asyncio.run(synthesize_all(texts))
+
+    assert audio == [expected_audio(text) for text in texts]
+    assert server.connections == 1
+    assert server.turns == 3
+
+
+def test_reconnects_when_the_server_drops_the_connection():
+    texts = ["first line", "second", "third line!"]
+    audio, pool, server = asyncio.run(synthesize_all(texts, close_after_turns=1))
+
+    assert audio == [expected_audio(text) for text in texts]
+    assert server.connections == 3
+    assert server.turns == 3
+
+
+def test_reuse_stats():
+    async def run():
+        server = MockTTSServer()
+        pool = TTSConnectionPool(url=await server.start())
+        try:
+            for text in ["a", "b", "c"]:
+                await pool.synthesize(text, VOICE)
+            return dict(pool.stats)
+        finally:
+            await pool.close()
+            await server.stop()
+
+    assert asyncio.run(run()) == {"opened": 1, "reused": 2, "evicted": 0}
+
+
+def test_idle_connections_are_evicted():
+    async def run():
+        server = MockTTSServer()
+        pool = TTSConnectionPool(url=await server.start(), idle_timeout=0.05)
+        try:
+            await pool.synthesize("hello", VOICE)
+            assert len(pool._idle[VOICE]) == 1
+
+            await asyncio.sleep(0.1)
+            await pool.evict_idle()
+            evicted = pool.stats["evicted"]
+            idle = len(pool._idle[VOICE])
+
+            # The next line opens a fresh connection
+            await pool.synthesize("hello", VOICE)
+            return evicted, idle, pool.stats["opened"], server.connections
+        finally:
+            await pool.close()
+            await server.stop()
+
+    assert asyncio.run(run()) == (1, 0, 2, 2)
+
+
+def test_ping_waits_for_the_pong():
+    async def run():
+        server = MockTTSServer()
+        pool = TTSConnectionPool(url=await server.start())
+        try:
+            await pool.synthesize("hello", VOICE)
+            connection = pool._idle[VOICE][0]
+            alive = await connection.ping(1)
+
+            await server.stop()  # Drops every open connection
+            dropped = await connection.ping(1)
+            return alive, dropped
+        finally:
+            await pool.close()
+            await server.stop()
+
+    assert asyncio.run(run()) == (True, False)
+
+
+def test_pool_refuses_a_second_event_loop_until_closed():
+    async def run(server, pool, close):
+        pool.url = await server.start()
+        try:
+            return await pool.synthesize("hello", VOICE)
+        finally:
+            if close:
+                await pool.close()
+            await server.stop()
+
+    pool = TTSConnectionPool()
+    asyncio.run(run(MockTTSServer(), pool, close=False))
+    with pytest.raises(TTSConnectionError):
+        asyncio.run(run(MockTTSServer(), pool, close=False))
+
+    # Once closed in its own loop, a pool can be used from a new one
+    pool = TTSConnectionPool()
+    asyncio.run(run(MockTTSServer(), pool, close=True))
+    audio = asyncio.run(run(MockTTSServer(), pool, close=True))
+    assert audio == expected_audio("hello")
+
+
+def test_eviction_while_a_new_voice_is_acquired():
+    async def run():
+        server = MockTTSServer()
+        pool = TTSConnectionPool(url=await server.start(), idle_timeout=0.05)
+        try:
+            await pool.synthesize("hello", "en-US-GuyNeural")
+            pool._reaper.cancel()
+            await asyncio.sleep(0.1)
+
+            # A pt line arrives while the en connection is being closed
+            eviction = asyncio.create_task(pool.evict_idle())
+            await asyncio.sleep(0)
+            audio = await pool.synthesize("olá", "pt-BR-FranciscaNeural")
+            await eviction
+
+            return audio, pool.stats["evicted"], len(pool._idle["en-US-GuyNeural"])
+        finally:
+            await pool.close()
+            await server.stop()
+
+    assert asyncio.run(run()) == (expected_audio("olá"), 1, 0)